@@ -1,129 +1,447 @@
+import glob
 import heapq
+import os
+import time
+from array import array
+from collections import OrderedDict
 
-class Node:
-    def __init__(self, state, parent=None, action=None, g=0, h=0):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.g = g  # cost from start
-        self.h = h  # estimated cost to goal
+from grid import Grid
+from landmarks import Landmarks, load_fields, save_fields
 
-    def f(self):
-        return self.g + self.h
+# Stands in for an infinite path cost in "i" arrays
+INF = 2**31 - 1
 
-    def __lt__(self, other):  # for heapq
-        return self.f() < other.f()
+# Per-goal distance fields: how many stay in memory, how many queries make a
+# goal popular enough to write its field to disk, and how many files to keep
+FIELDS_IN_MEMORY = 8
+POPULAR_GOAL = 3
+FIELDS_ON_DISK = 16
 
 
 class PriorityQueueFrontier:
-    def __init__(self):
+    def __init__(self, size):
         self.elements = []
+        self.g = array("i", [-1]) * size  # cheapest g queued per cell
+        self.queued = bytearray(size)  # 1 while a cell has a live entry
+        self.count = 0
 
-    def add(self, node):
-        heapq.heappush(self.elements, (node.f(), node))
+    def add(self, state, g, h):
+        # A cheaper path to a queued cell replaces the old entry; the stale
+        # entry stays in the heap and is skipped when it surfaces (lazy deletion)
+        if self.queued[state]:
+            if g >= self.g[state]:
+                return
+        else:
+            self.queued[state] = 1
+            self.count += 1
+        self.g[state] = g
+        # Lowest f first, ties broken towards the goal
+        heapq.heappush(self.elements, (g + h, h, g, state))
 
     def contains_state(self, state):
-        return any(node.state == state for _, node in self.elements)
+        return self.queued[state] == 1
+
+    def g_cost(self, state):
+        return self.g[state] if self.queued[state] else float("inf")
 
     def empty(self):
-        return len(self.elements) == 0
+        return self.count == 0
 
     def remove(self):
         if self.empty():
             raise Exception("Empty frontier")
-        return heapq.heappop(self.elements)[1]
+        while True:
+            f, h, g, state = heapq.heappop(self.elements)
+            if self.queued[state] and g == self.g[state]:
+                self.queued[state] = 0
+                self.count -= 1
+                return state, self.g[state]
 
 
 class Maze:
-    def __init__(self, filename):
-        with open(filename, "r") as file:
-            contents = file.read()
-
-        if contents.count("A") != 1:
-            raise Exception("Maze must have exactly one start point")
-        if contents.count("B") != 1:
-            raise Exception("Maze must have exactly one goal")
-
-        self.contents = contents.splitlines()
-        self.height = len(self.contents)
-        self.width = max(len(line) for line in self.contents)
-
-        self.start = None
-        self.goal = None
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.contents[i][j] == "A":
-                    self.start = (i, j)
-                elif self.contents[i][j] == "B":
-                    self.goal = (i, j)
+    def __init__(self, filename, grid=None):
+        # An already compiled grid may be passed in to skip loading the file
+        self.filename = filename
+        self.grid = Grid.load(filename) if grid is None else grid
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.start = self.grid.start
+        self.goal = self.grid.goal
 
         self.solution = None
-        self.path_cost = 0
+        self.num_explored = 0
+        self.alt = None  # Landmarks, loaded or computed on first use
+        self.fields = OrderedDict()  # goal -> distance field, least recent first
+        self.queries = {}  # goal -> number of "field" queries
+        self.saved = set()  # goals whose field matches the file on disk
 
     def print(self):
         solution = self.solution[1] if self.solution else []
 
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i, j) in solution and self.contents[i][j] == " ":
-                    print("*", end="")
-                else:
-                    print(self.contents[i][j], end="")
-            print()
+        for line in self.grid.draw(solution):
+            print(line)
         print("Path cost:", self.path_cost)
+        print("States explored:", self.num_explored)
+
+    @property
+    def path_cost(self):
+        # Number of steps on the solution path; every move costs 1
+        return len(self.solution[0]) if self.solution is not None else None
+
+    def heuristic(self, state, goal):
+        # Manhattan distance between two cells
+        row, col = divmod(state, self.grid.stride)
+        goal_row, goal_col = divmod(goal, self.grid.stride)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    def landmarks(self, count=8):
+        """Return the ALT landmarks, preprocessing and persisting them once.
+
+        The distance fields are cached in a file next to the maze and reused
+        as long as the maze itself has not changed. A maze built from a grid
+        alone (no filename) keeps them in memory only.
+        """
+        if self.alt is None and self.filename is None:
+            self.alt = Landmarks.select(self.grid, count)
+        elif self.alt is None:
+            filename = self.filename + ".landmarks"
+            self.alt = Landmarks.load(filename, self.grid)
+            if self.alt is None:
+                self.alt = Landmarks.select(self.grid, count)
+                self.alt.save(filename, self.grid)
+        return self.alt
+
+    def distance_field(self, goal):
+        """Return exact distances to goal (a cell id).
+
+        The fields of recently queried goals stay in memory, so repeated
+        queries never touch the disk. A goal queried POPULAR_GOAL times has
+        its field written next to the maze for later runs; only the
+        FIELDS_ON_DISK most recently used files are kept. Nothing is written
+        for a maze without a filename.
+        """
+        filename = None
+        if self.filename is not None:
+            row, col = self.grid.coordinates(goal)
+            filename = f"{self.filename}.goal-{row}-{col}"
+        self.queries[goal] = self.queries.get(goal, 0) + 1
+
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+        else:
+            # A file that is missing or stale (the maze changed) is rejected
+            loaded = filename and load_fields(filename, self.grid)
+            if loaded:
+                field = loaded[1][0]
+                self.saved.add(goal)
+                os.utime(filename)  # mark as recently used
+            else:
+                field = self.grid.distances(goal)
+                self.saved.discard(goal)
+            self.fields[goal] = field
+            if len(self.fields) > FIELDS_IN_MEMORY:
+                self.fields.popitem(last=False)
+
+        # Save again if the file was pruned since, by this or another process
+        popular = filename is not None and self.queries[goal] >= POPULAR_GOAL
+        if popular and (goal not in self.saved or not os.path.exists(filename)):
+            save_fields(filename, self.grid, [goal], [field])
+            self.saved.add(goal)
+            persisted = sorted(
+                glob.glob(glob.escape(self.filename) + ".goal-*-*"), key=os.path.getmtime
+            )
+            for stale in persisted[:-FIELDS_ON_DISK]:
+                os.remove(stale)
+        return field
+
+    def forget_distances(self):
+        """Drop landmark and goal distances after the grid changed in place."""
+        self.alt = None
+        self.fields.clear()
+        self.saved.clear()
+
+    def jump(self, state, direction, goal):
+        """Move from state in direction until a jump point; return it or -1.
 
-    def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1)),
-        ]
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width:
-                if self.contents[r][c] == " " or self.contents[r][c] == "B":
-                    result.append((action, (r, c)))
-        return result
-
-    def heuristic(self, state):
-        # Manhattan distance
-        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
-
-    def solve(self):
-        start_node = Node(state=self.start, g=0, h=self.heuristic(self.start))
-        frontier = PriorityQueueFrontier()
-        frontier.add(start_node)
-        explored = set()
+        Jump Point Search for 4-connected grids: a horizontal run stops where
+        a wall beside it ends, opening a new vertical direction; a vertical
+        run also stops wherever a horizontal run from it would find a jump
+        point. Cells passed over have an equally short path through the jump
+        points, so they never enter the frontier. The scans still touch most
+        cells of an open floor, so there JPS expands far fewer nodes than A*
+        but takes about as long; buffers without find() (shared memory) fall
+        back to a per-cell loop that is much slower there.
+        """
+        passable = self.grid.passable
+        horizontal = direction in (1, -1)
+        if horizontal and hasattr(passable, "find"):
+            return self.scan(state, direction, goal)
+        side = self.grid.stride if horizontal else 1
+        while True:
+            state += direction
+            if not passable[state]:
+                return -1
+            if state == goal:
+                return state
+            if (passable[state - side] and not passable[state - direction - side]) or (
+                passable[state + side] and not passable[state - direction + side]
+            ):
+                return state
+            if not horizontal and (
+                self.jump(state, 1, goal) != -1 or self.jump(state, -1, goal) != -1
+            ):
+                return state
+
+    def scan(self, state, direction, goal):
+        """Horizontal jump() using byte searches instead of a Python loop.
+
+        Every step of a vertical run scans its row both ways, so on open
+        floors nearly every cell is scanned; searching the row and the rows
+        beside it with find/rfind keeps that work in C. The forced cells are
+        where the row above or below changes from wall to open.
+        """
+        passable = self.grid.passable
+        stride = self.grid.stride
+        if not passable[state + direction]:
+            # Corridors mostly end at once; skip the searches
+            return -1
+        if direction == 1:
+            wall = passable.find(b"\x00", state + 1)
+            found = wall
+            for side in (-stride, stride):
+                wall_ends = passable.find(b"\x00\x01", state + side, wall + side)
+                if wall_ends != -1:
+                    found = min(found, wall_ends + 1 - side)
+            if state < goal < found:
+                found = goal
+        else:
+            wall = passable.rfind(b"\x00", 0, state)
+            found = wall
+            for side in (-stride, stride):
+                wall_ends = passable.rfind(b"\x01\x00", wall + 1 + side, state + 1 + side)
+                if wall_ends != -1:
+                    found = max(found, wall_ends - side)
+            if found < goal < state:
+                found = goal
+        return -1 if found == wall else found
+
+    def endpoints(self, start, goal):
+        """Return the cell ids of (row, col) start and goal, defaulting to A and B."""
+        start = self.start if start is None else start
+        goal = self.goal if goal is None else goal
+        if not self.grid.inside(start) or not self.grid.inside(goal):
+            raise Exception("Start and goal must be inside the maze")
+        start = self.grid.cell(start)
+        goal = self.grid.cell(goal)
+        if not self.grid.passable[start] or not self.grid.passable[goal]:
+            raise Exception("Start and goal must be open cells")
+        return start, goal
+
+    def solve(self, strategy="astar", start=None, goal=None, weight=1):
+        """Find a shortest path, by default from A to B.
+
+        Strategies: "astar" (Manhattan heuristic), "jps" (Jump Point Search),
+        "alt" (A* with landmark heuristics), "field" (follow a cached
+        distance field to the goal) and "wavefront" (vectorized breadth-first
+        search, needs NumPy). start and goal are (row, col) cells.
+
+        A weight above 1 makes the heuristic searches weighted A*
+        (f = g + weight * h): fewer expansions, and a path at most weight
+        times longer than the shortest.
+        """
+        if strategy not in ("astar", "jps", "alt", "field", "wavefront"):
+            raise Exception(f"Unknown strategy: {strategy}")
+
+        grid = self.grid
+        passable = grid.passable
+        stride = grid.stride
+        offsets = [offset for _, offset in grid.moves]
+        start, goal = self.endpoints(start, goal)
+
+        self.solution = None
+        self.num_explored = 0
+
+        if strategy == "field":
+            # Walk straight down the field; nothing here is sized by the maze
+            field = self.distance_field(goal)
+            if field[start] == -1:
+                return
+            actions = []
+            cells = []
+            state = start
+            while state != goal:
+                self.num_explored += 1
+                for action, offset in grid.moves:
+                    if field[state + offset] == field[state] - 1:
+                        state += offset
+                        actions.append(action)
+                        cells.append(grid.coordinates(state))
+                        break
+            self.solution = (actions, cells)
+            return
+
+        if strategy == "wavefront":
+            from wavefront import descend, distance_map
+
+            distance = distance_map(grid, start)
+            self.num_explored = int((distance >= 0).sum())
+            self.solution = descend(grid, distance, goal)
+            return
+
+        parent = grid.parents()
+
+        if strategy == "alt":
+            landmarks = self.landmarks()
+
+            def heuristic(state, goal):
+                return max(self.heuristic(state, goal), landmarks.heuristic(state, goal))
+        else:
+            heuristic = self.heuristic
+        if weight != 1:
+            unweighted = heuristic
+
+            def heuristic(state, goal):
+                return weight * unweighted(state, goal)
+
+        frontier = PriorityQueueFrontier(grid.size)
+        frontier.add(start, 0, heuristic(start, goal))
+        explored = bytearray(grid.size)
 
         while not frontier.empty():
-            node = frontier.remove()
-
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+            state, g = frontier.remove()
+
+            if state == goal:
+                self.solution = grid.path(parent, goal)
+                return
+
+            explored[state] = 1
+            self.num_explored += 1
+
+            if strategy != "jps":
+                g += 1
+                for offset in offsets:
+                    child = state + offset
+                    if passable[child] and not explored[child] and g < frontier.g_cost(child):
+                        parent[child] = state
+                        frontier.add(child, g, heuristic(child, goal))
+                continue
+
+            # Jump Point Search: keep going the way we came, or turn aside
+            if parent[state] == -1:
+                directions = offsets
+            else:
+                direction = grid.step(state - parent[state])
+                side = stride if direction in (1, -1) else 1
+                directions = (direction, side, -side)
+            for direction in directions:
+                child = self.jump(state, direction, goal)
+                if child == -1 or explored[child]:
+                    continue
+                cost = g + (child - state) // direction
+                if cost < frontier.g_cost(child):
+                    parent[child] = state
+                    frontier.add(child, cost, heuristic(child, goal))
+
+    def solve_anytime(self, budget, weight=3, step=0.5, start=None, goal=None):
+        """Anytime Repairing A* (ARA*): yield ever better paths until budget runs out.
+
+        The first search is weighted A* with the given weight. After each
+        solution the weight drops by step and the search resumes from the
+        previous one instead of starting over. Stops once a path is proven
+        shortest or budget seconds have passed; the first search always runs
+        to completion. Yields (solution, bound, expansions) per iteration,
+        where the path is at most bound times longer than the shortest one.
+        """
+        deadline = time.monotonic() + budget
+        grid = self.grid
+        passable = grid.passable
+        offsets = [offset for _, offset in grid.moves]
+        heuristic = self.heuristic
+        start, goal = self.endpoints(start, goal)
+
+        g = array("i", [INF]) * grid.size
+        parent = grid.parents()
+        opened = bytearray(grid.size)  # 1 while a cell has a live heap entry
+        closed = bytearray(grid.size)  # expanded during the current search
+        inconsistent = []  # closed cells improved since their expansion
+
+        g[start] = 0
+        h = heuristic(start, goal)
+        elements = [(weight * h, h, 0, start)]
+        opened[start] = 1
+        first = True
+
+        while True:
+            expansions = 0
+            while elements:
+                f, h, cost, state = elements[0]
+                if not opened[state] or cost != g[state]:
+                    heapq.heappop(elements)
+                    continue
+                if g[goal] <= f:
+                    break
+                if not first and expansions % 1024 == 0 and time.monotonic() > deadline:
+                    return
+                heapq.heappop(elements)
+                opened[state] = 0
+                closed[state] = 1
+                expansions += 1
+
+                cost += 1
+                for offset in offsets:
+                    child = state + offset
+                    if passable[child] and cost < g[child]:
+                        g[child] = cost
+                        parent[child] = state
+                        if closed[child]:
+                            # Revisited only in the next, tighter search
+                            inconsistent.append(child)
+                        else:
+                            opened[child] = 1
+                            h = heuristic(child, goal)
+                            heapq.heappush(elements, (cost + weight * h, h, cost, child))
+            first = False
+            if g[goal] == INF:
                 return
 
-            explored.add(node.state)
-            self.path_cost += 1
+            # The shortest path is at least the smallest unweighted f among
+            # the cells that could still improve it
+            pending = {
+                state for _, _, cost, state in elements if opened[state] and cost == g[state]
+            }
+            pending.update(inconsistent)
+            lower = min((g[state] + heuristic(state, goal) for state in pending), default=g[goal])
+            bound = min(weight, g[goal] / lower) if lower else 1
+
+            self.solution = grid.path(parent, goal)
+            self.num_explored = expansions
+            yield self.solution, bound, expansions
 
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in explored:
-                    g = node.g + 1
-                    h = self.heuristic(state)
-                    child = Node(state=state, parent=node, action=action, g=g, h=h)
-                    frontier.add(child)
+            if bound <= 1 or time.monotonic() > deadline:
+                return
+            weight = max(1, min(weight - step, bound))
+            elements = []
+            for state in pending:
+                h = heuristic(state, goal)
+                elements.append((g[state] + weight * h, h, g[state], state))
+                opened[state] = 1
+            heapq.heapify(elements)
+            inconsistent = []
+            closed = bytearray(grid.size)
 
 
 # Usage:
-maze = Maze("Maze.txt")
-maze.solve()
-maze.print()
+if __name__ == "__main__":
+    maze = Maze("Maze.txt")
+    maze.solve()
+    maze.print()
+
+    # Jump Point Search finds a path of the same length with fewer expansions
+    jps = Maze("Maze.txt")
+    jps.solve(strategy="jps")
+    print("Nodes expanded: A*", maze.num_explored, "JPS", jps.num_explored)
+
+    # Anytime search: a quick first path, then shorter ones within 50 ms
+    for solution, bound, expansions in Maze("Maze.txt").solve_anytime(0.05):
+        print("Path length:", len(solution[0]), "bound:", round(bound, 2), "expanded:", expansions)
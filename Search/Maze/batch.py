@@ -0,0 +1,112 @@
+import os
+import weakref
+import zlib
+from collections import OrderedDict
+from multiprocessing import Pool, shared_memory
+
+from grid import Grid
+from Maze_A_search import Maze
+
+# Recently solved queries per maze, with the checksum of the grid they were
+# solved on, see solve_many
+caches = weakref.WeakKeyDictionary()
+
+# Set in each worker process by attach()
+worker = None
+
+
+class PathCache:
+    """Least recently used cache of query results keyed on (start, goal)."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+
+    def __contains__(self, query):
+        return query in self.results
+
+    def get(self, query):
+        self.results.move_to_end(query)
+        return self.results[query]
+
+    def put(self, query, result):
+        self.results[query] = result
+        self.results.move_to_end(query)
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+
+def attach(name, height, width, strategy):
+    """Pool initializer: wrap the shared grid in a Maze without copying it."""
+    global worker
+    memory = shared_memory.SharedMemory(name=name)
+    grid = Grid(height, width, passable=memory.buf)
+    maze = Maze(None, grid=grid)
+    worker = (memory, maze, strategy)
+
+
+def solve_query(query, maze=None, strategy=None):
+    if maze is None:
+        _, maze, strategy = worker
+    # A wall or a cell outside the maze has no path; answer None for that
+    # query rather than failing the whole batch
+    grid = maze.grid
+    for cell in query:
+        if not grid.inside(cell) or not grid.passable[grid.cell(cell)]:
+            return None
+    start, goal = query
+    maze.solve(strategy=strategy, start=start, goal=goal)
+    if maze.solution is None:
+        return None
+    actions, cells = maze.solution
+    return (actions, cells, len(actions))
+
+
+def solve_many(maze, queries, workers=None, strategy="astar", cache_size=4096):
+    """Solve (start, goal) queries on one maze across a pool of processes.
+
+    The compiled grid is copied into shared memory once and every worker
+    reads it from there. Each result is (actions, cells, cost), or None when
+    the goal cannot be reached or either cell is a wall or outside the maze,
+    in the same order as queries. Results are kept in an LRU cache per maze,
+    so repeated queries are answered without searching again until the grid
+    changes.
+
+    workers defaults to the number of CPUs; with workers=1 the queries are
+    solved in this process.
+    """
+    if strategy not in ("astar", "jps"):
+        raise Exception(f"Unknown strategy: {strategy}")
+    # The grid can change in place (IncrementalPlanner.set_blocked), which
+    # makes every cached path suspect
+    checksum = zlib.crc32(maze.grid.passable)
+    if maze not in caches or caches[maze][0] != checksum:
+        caches[maze] = (checksum, PathCache(cache_size))
+    cache = caches[maze][1]
+
+    queries = [(tuple(start), tuple(goal)) for start, goal in queries]
+    found = {query: cache.get(query) for query in queries if query in cache}
+    missing = [query for query in dict.fromkeys(queries) if query not in found]
+
+    if missing and workers == 1:
+        solved = [solve_query(query, maze, strategy) for query in missing]
+    elif missing:
+        grid = maze.grid
+        memory = shared_memory.SharedMemory(create=True, size=grid.size)
+        try:
+            memory.buf[:grid.size] = grid.passable
+            initargs = (memory.name, grid.height, grid.width, strategy)
+            workers = workers or os.cpu_count()
+            chunksize = max(1, len(missing) // (4 * workers))
+            with Pool(workers, initializer=attach, initargs=initargs) as pool:
+                solved = pool.map(solve_query, missing, chunksize)
+        finally:
+            memory.close()
+            memory.unlink()
+    else:
+        solved = []
+
+    for query, result in zip(missing, solved):
+        found[query] = result
+        cache.put(query, result)
+    return [found[query] for query in queries]
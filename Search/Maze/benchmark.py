@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import gbfs
+import Maze_A_search
+from generate import KINDS, save
+from grid import Grid
+
+# Strategy name -> module whose Maze.solve implements it
+SOLVERS = {
+    "astar": Maze_A_search,
+    "jps": Maze_A_search,
+    "dfs": gbfs,
+    "bfs": gbfs,
+    "gbfs": gbfs,
+}
+
+
+def run(maze, strategy):
+    try:
+        maze.solve(strategy=strategy)
+    except Exception as error:
+        # gbfs.py reports an unreachable goal by raising
+        if str(error) != "No solution":
+            raise
+
+
+def measure(filename, strategy):
+    """Solve one maze file with one strategy and return its measurements.
+
+    Wall time comes from a plain run and peak memory from a second run under
+    tracemalloc, which slows Python down too much to time it. Loading the
+    file is not included in either.
+    """
+    module = SOLVERS[strategy]
+    maze = module.Maze(filename)
+    began = time.perf_counter()
+    run(maze, strategy)
+    seconds = time.perf_counter() - began
+
+    traced = module.Maze(filename)
+    tracemalloc.start()
+    run(traced, strategy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "solver": module.__name__,
+        "strategy": strategy,
+        "expanded": maze.num_explored,
+        "path_length": maze.path_cost,
+        "seconds": round(seconds, 6),
+        "peak_bytes": peak,
+    }
+
+
+def benchmark(kinds, sizes, seeds, strategies, directory):
+    """Generate every (kind, size, seed) maze into directory and run each strategy on it."""
+    records = []
+    for kind in kinds:
+        for size in sizes:
+            for seed in seeds:
+                filename = os.path.join(directory, f"{kind}-{size}-{seed}.txt")
+                save(filename, kind, size, seed)
+
+                began = time.perf_counter()
+                grid = Grid.load(filename)
+                load_seconds = time.perf_counter() - began
+
+                records.append({
+                    "kind": kind,
+                    "size": size,
+                    "seed": seed,
+                    "height": grid.height,
+                    "width": grid.width,
+                    "load_seconds": round(load_seconds, 6),
+                    "results": [measure(filename, strategy) for strategy in strategies],
+                })
+                print(f"{kind} {size} seed {seed} done", file=sys.stderr)
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers on generated mazes")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10**3, 10**4, 10**5],
+                        help="approximate number of cells, up to 10**8")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--strategies", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument("--directory", help="keep the generated mazes here")
+    parser.add_argument("--output", help="JSON results file (default: standard output)")
+    args = parser.parse_args()
+
+    if args.directory:
+        os.makedirs(args.directory, exist_ok=True)
+        records = benchmark(args.kinds, args.sizes, args.seeds, args.strategies, args.directory)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            records = benchmark(args.kinds, args.sizes, args.seeds, args.strategies, directory)
+
+    report = {"python": sys.version.split()[0], "mazes": records}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
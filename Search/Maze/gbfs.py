@@ -1,136 +1,119 @@
-class Node:
-    def __init__(self, action= None, parent=None, state=None):
-        self.action= action
-        self.parent= parent
-        self.state = state
+import heapq
+from collections import deque
+
+from grid import Grid
 
 class  StackFrontier:
-    def __init__(self):
+    def __init__(self,size):
         self.frontier = []
-    def add(self,node):
-        self.frontier.append(node)
+        self.members = bytearray(size)  # 1 while a cell is on the frontier
+    def add(self,state):
+        self.frontier.append(state)
+        self.members[state] = 1
     def contains_state(self,state):
-        return any(state == node.state for node in self.frontier)
+        return self.members[state] == 1
     def empty(self):
         return len(self.frontier)==0
     def remove(self):
         if self.empty():
             raise Exception("Empty")
-        node = self.frontier.pop()
-        return node
+        state = self.frontier.pop()
+        self.members[state] = 0
+        return state
 class QueueFrontier(StackFrontier):
+    def __init__(self,size):
+        super().__init__(size)
+        self.frontier = deque()
     def remove(self):
         if self.empty():
             raise Exception("Empty")
-        node = self.frontier[0]
-        self.frontier = self.frontier[1:]
-        return node
+        state = self.frontier.popleft()
+        self.members[state] = 0
+        return state
+class GreedyFrontier(StackFrontier):
+    def __init__(self,size,heuristic):
+        super().__init__(size)
+        self.heuristic = heuristic
+    def add(self,state):
+        # Ties on the heuristic go to the lower cell id, keeping runs repeatable
+        heapq.heappush(self.frontier, (self.heuristic(state), state))
+        self.members[state] = 1
+    def remove(self):
+        if self.empty():
+            raise Exception("Empty")
+        state = heapq.heappop(self.frontier)[1]
+        self.members[state] = 0
+        return state
 
 
 class Maze:
     def __init__(self, filename):
         self.filename = filename
-        with open(filename,"r") as  file:
-            content = file.read()
-
-        if content.count("A") !=1:
-            raise Exception("The Maze must contain 1 starting point")
-        if content.count("B") !=1:
-            raise Exception("The Maze must contain 1 goal ")
-        content = content.splitlines()
-        self.height = len(content)
-        self.width = max((len(line)) for line in content)
-        self.content = content
-
-        for i in range(self.height):
-            for j in range(self.width):
-                if content[i][j] == "A":
-                    self.start = (i,j)
-                elif content[i][j] == "B":
-                    self.goal = (i, j)
+        self.grid = Grid.load(filename)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.start = self.grid.start
+        self.goal = self.grid.goal
         self.solution = None
-        self.path_cost = 0
+        self.num_explored = 0
 
     def print(self):
         solution = []
         if self.solution is not None:
             solution = self.solution[1]  # list of coordinates
 
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i, j) in solution and self.content[i][j] == " ":
-                    print("*", end="")
-                else:
-                    print(self.content[i][j], end="")
-            print()
+        for line in self.grid.draw(solution):
+            print(line)
         print("Path cost:", self.path_cost)
+        print("States explored:", self.num_explored)
 
-    def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1)),
-        ]
-        result = []
-        for action, (r,c) in candidates:
-            try:
-                if self.content[r][c] == " " or  self.content[r][c] == "B":
-                    result.append((action, (r,c)))
-            except IndexError:
-                continue
-        return result
+    @property
+    def path_cost(self):
+        # Number of steps on the solution path; every move costs 1
+        return len(self.solution[0]) if self.solution is not None else None
 
-    def GbfsFrontier(self,gbfs,h,child_pair):
-        for i in range(len(gbfs)):
-            if gbfs[i][1]>h:
-                gbfs.insert(i,child_pair)
-                return gbfs
-        gbfs.append(child_pair)
-        return gbfs
-    
     def Heuristic(self,state):
-        goal_x, goal_y = self.goal
-        x, y = state
+        goal_x, goal_y = divmod(self.grid.cell(self.goal), self.grid.stride)
+        x, y = divmod(state, self.grid.stride)
         return abs(goal_x - x) + abs(goal_y - y)
 
-    def solve(self):
-        node = Node(action=None, state= self.start, parent=None)
-        frontier = StackFrontier()
-        frontier.add(node)
-        explored = set()
+    def solve(self, strategy="gbfs"):
+        grid = self.grid
+        passable = grid.passable
+        start = grid.cell(self.start)
+        goal = grid.cell(self.goal)
+        if strategy == "dfs":
+            frontier = StackFrontier(grid.size)
+        elif strategy == "bfs":
+            frontier = QueueFrontier(grid.size)
+        elif strategy == "gbfs":
+            frontier = GreedyFrontier(grid.size, self.Heuristic)
+        else:
+            raise Exception(f"Unknown strategy: {strategy}")
+        frontier.add(start)
+        explored = bytearray(grid.size)
+        self.solution = None
+        self.num_explored = 0
+        parent = grid.parents()
 
         while True:
             if frontier.empty():
                 raise Exception("No solution")
-            node = frontier.remove()
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+            state = frontier.remove()
+            if state == goal:
+                self.solution = grid.path(parent, goal)
                 return
-            gbfs = []
-            explored.add(node.state)
-            self.path_cost += 1
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in explored:
-                    child = Node(parent=node, action=action, state=state)
-                    h = self.Heuristic(child.state)
-                    gbfs = self.GbfsFrontier(gbfs,h,(child,h))
-                if gbfs:
-                    frontier.add(gbfs[0][0])
-
-
+            explored[state] = 1
+            self.num_explored += 1
+            for _, offset in grid.moves:
+                child = state + offset
+                if passable[child] and not explored[child] and not frontier.contains_state(child):
+                    parent[child] = state
+                    frontier.add(child)
 
-maze = Maze("Maze.txt")
-maze.solve()
-maze.print()
 
 
+if __name__ == "__main__":
+    maze = Maze("Maze.txt")
+    maze.solve()
+    maze.print()
@@ -0,0 +1,128 @@
+import argparse
+import gzip
+import math
+import random
+
+def backtracker(height, width, rng):
+    """A perfect maze (one path between any two cells) by recursive backtracking.
+
+    Corridors run along odd rows and columns; the recursion is an explicit
+    stack so very large mazes do not hit the recursion limit.
+    """
+    cells = bytearray(height * width)
+    start = width + 1
+    cells[start] = 1
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        row, col = divmod(cell, width)
+        options = []
+        if row > 2 and not cells[cell - 2 * width]:
+            options.append(-width)
+        if row < height - 3 and not cells[cell + 2 * width]:
+            options.append(width)
+        if col > 2 and not cells[cell - 2]:
+            options.append(-1)
+        if col < width - 3 and not cells[cell + 2]:
+            options.append(1)
+        if not options:
+            stack.pop()
+            continue
+        step = rng.choice(options)
+        cells[cell + step] = 1
+        cells[cell + 2 * step] = 1
+        stack.append(cell + 2 * step)
+    return cells
+
+
+def rooms(height, width, rng, size=12):
+    """Open rooms of random size separated by walls, one door per shared wall."""
+    cells = bytearray(b"\x01") * (height * width)
+
+    def walls(length):
+        positions = [0]
+        while positions[-1] + size // 2 < length - 1:
+            positions.append(min(positions[-1] + rng.randint(size // 2, size), length - 1))
+        positions[-1] = length - 1
+        return positions
+
+    rows = walls(height)
+    cols = walls(width)
+    for row in rows:
+        cells[row * width:(row + 1) * width] = bytes(width)
+    for col in cols:
+        cells[col::width] = bytes(height)
+
+    # Each wall segment between two neighbouring rooms gets one door
+    for top, bottom in zip(rows, rows[1:]):
+        for left, right in zip(cols, cols[1:]):
+            if bottom - top > 1 and right - left > 1:
+                if right < width - 1:
+                    cells[rng.randint(top + 1, bottom - 1) * width + right] = 1
+                if bottom < height - 1:
+                    cells[bottom * width + rng.randint(left + 1, right - 1)] = 1
+    return cells
+
+
+def field(height, width, rng, density=0.25):
+    """An open floor with a fraction of its cells blocked at random."""
+    cells = bytearray(height * width)
+    for row in range(1, height - 1):
+        base = row * width
+        for col in range(1, width - 1):
+            if rng.random() >= density:
+                cells[base + col] = 1
+    return cells
+
+
+# Maze kinds by name
+KINDS = {"backtracker": backtracker, "rooms": rooms, "field": field}
+
+
+def generate(kind, size, seed):
+    """Build a seeded square maze of about size cells.
+
+    Returns (side, cells): the side length and the maze characters row by
+    row, with A in the top left corner and B in the bottom right one.
+    """
+    if kind not in KINDS:
+        raise Exception(f"Unknown maze kind: {kind}")
+    rng = random.Random(seed)
+    # Odd sides keep the backtracker's corridors inside the outer wall
+    side = max(5, math.isqrt(size) | 1)
+    cells = KINDS[kind](side, side, rng)
+
+    start = side + 1
+    goal = side * side - side - 2
+    if kind == "field":
+        # Clear the corners so A and B are not walled in
+        for cell in (start, start + 1, start + side, goal, goal - 1, goal - side):
+            cells[cell] = 1
+
+    table = bytearray(range(256))
+    table[0] = ord("#")
+    table[1] = ord(" ")
+    cells = cells.translate(table)
+    cells[start] = ord("A")
+    cells[goal] = ord("B")
+    return side, cells
+
+
+def save(filename, kind, size, seed):
+    """Write a generated maze to filename, gzip-compressed if it ends in .gz."""
+    side, cells = generate(kind, size, seed)
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "wb") as file:
+        for begin in range(0, len(cells), side):
+            file.write(cells[begin:begin + side])
+            file.write(b"\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a maze file")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("size", type=int, help="approximate number of cells")
+    parser.add_argument("filename", help="output file, gzip-compressed if it ends in .gz")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    save(args.filename, args.kind, args.size, args.seed)
@@ -0,0 +1,221 @@
+import gzip
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+
+# Cells a search may step onto; everything else is a wall
+PASSABLE = " AB"
+
+# bytes.translate table mapping maze characters to 1 (passable) or 0 (wall)
+TABLE = bytes(1 if chr(byte) in PASSABLE else 0 for byte in range(256))
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class Grid:
+    """A maze compiled into a flat bytearray of passable cells.
+
+    The grid is surrounded by a one-cell wall border, so a neighbour is always
+    cell + offset with no bounds check. Cells are identified by their integer
+    index into the padded grid.
+    """
+
+    def __init__(self, height, width, passable=None):
+        self.height = height
+        self.width = width
+        self.stride = self.width + 2
+        self.size = self.stride * (self.height + 2)
+        # Any writable buffer of self.size bytes works, e.g. shared memory
+        self.passable = bytearray(self.size) if passable is None else passable
+        self.start = None
+        self.goal = None
+
+        # (action, offset) pairs in the order neighbours are expanded
+        self.moves = (
+            ("up", -self.stride),
+            ("down", self.stride),
+            ("left", -1),
+            ("right", 1),
+        )
+        self.actions = {offset: action for action, offset in self.moves}
+
+    @classmethod
+    def load(cls, filename):
+        """Compile a maze file, which may be gzip-compressed.
+
+        Plain files are memory-mapped and never decoded into a string; only
+        one row is copied out of the map at a time, and compressed files are
+        streamed. Rows shorter than the widest one are padded with walls.
+        """
+        with open(filename, "rb") as file:
+            if file.read(2) == GZIP_MAGIC:
+                return cls.from_gzip(filename)
+
+            if os.fstat(file.fileno()).st_size == 0:
+                raise Exception("Maze must have exactly one start point")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return cls.from_mmap(data)
+
+    @classmethod
+    def from_gzip(cls, filename):
+        """Compile a gzip-compressed maze in two streaming passes.
+
+        The first pass sizes the grid and finds A and B; the second
+        decompresses the file again and fills the grid one row at a time, so
+        the decompressed maze is never held in memory.
+        """
+        counts = {b"A": 0, b"B": 0}
+        positions = {}
+        height = 0
+        width = 0
+        with gzip.open(filename) as stream:
+            for i, line in enumerate(stream):
+                row = line.rstrip(b"\r\n")
+                for char in counts:
+                    found = row.count(char)
+                    if found:
+                        counts[char] += found
+                        positions[char] = (i, row.index(char))
+                height = i + 1
+                width = max(width, len(row))
+
+        for char, name in ((b"A", "start point"), (b"B", "goal")):
+            if counts[char] != 1:
+                raise Exception(f"Maze must have exactly one {name}")
+
+        grid = cls(height, width)
+        grid.start = positions[b"A"]
+        grid.goal = positions[b"B"]
+        with gzip.open(filename) as stream:
+            grid.fill(line.rstrip(b"\r\n") for line in stream)
+        return grid
+
+    @classmethod
+    def from_mmap(cls, data):
+        positions = []
+        for char, name in ((b"A", "start point"), (b"B", "goal")):
+            position = data.find(char)
+            if position == -1 or data.find(char, position + 1) != -1:
+                raise Exception(f"Maze must have exactly one {name}")
+            positions.append(position)
+
+        # First pass: record where each line ends to size the grid
+        ends = array("q")
+        width = 0
+        begin = 0
+        while begin < len(data):
+            end = data.find(b"\n", begin)
+            if end == -1:
+                end = len(data)
+            ends.append(end)
+            length = end - begin
+            if length and data[end - 1] == 13:  # "\r"
+                length -= 1
+            width = max(width, length)
+            begin = end + 1
+
+        grid = cls(len(ends), width)
+        grid.start, grid.goal = (cls.locate(ends, position) for position in positions)
+
+        # Second pass: translate one row at a time straight into the grid
+        grid.fill(
+            data[ends[i - 1] + 1 if i else 0:ends[i]].rstrip(b"\r")
+            for i in range(len(ends))
+        )
+        return grid
+
+    @staticmethod
+    def locate(ends, position):
+        """Convert a byte offset into (row, col) given the line end offsets."""
+        row = bisect_left(ends, position)
+        return (row, position - (ends[row - 1] + 1 if row else 0))
+
+    def fill(self, rows):
+        for i, row in enumerate(rows):
+            base = self.cell((i, 0))
+            self.passable[base:base + len(row)] = row.translate(TABLE)
+
+    def cell(self, coordinates):
+        row, col = coordinates
+        return (row + 1) * self.stride + col + 1
+
+    def inside(self, coordinates):
+        """Whether (row, col) lies in the maze; the wall border does not count."""
+        row, col = coordinates
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def coordinates(self, cell):
+        row, col = divmod(cell, self.stride)
+        return (row - 1, col - 1)
+
+    def step(self, difference):
+        """Return the unit offset pointing along a straight run of cells."""
+        if difference % self.stride == 0:
+            return self.stride if difference > 0 else -self.stride
+        return 1 if difference > 0 else -1
+
+    def parents(self):
+        """Return an array of parent links, one per cell, all unset (-1)."""
+        return array("i", [-1]) * self.size
+
+    def distances(self, source):
+        """Return the breadth-first distance from source to every cell.
+
+        Walls and cells that cannot be reached are -1.
+        """
+        passable = self.passable
+        offsets = [offset for _, offset in self.moves]
+        distance = array("i", [-1]) * self.size
+        distance[source] = 0
+        level = [source]
+        steps = 0
+        while level:
+            steps += 1
+            next_level = []
+            for cell in level:
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if passable[neighbor] and distance[neighbor] == -1:
+                        distance[neighbor] = steps
+                        next_level.append(neighbor)
+            level = next_level
+        return distance
+
+    def path(self, parent, goal):
+        """Follow parent links back from goal and return (actions, cells)."""
+        actions = []
+        cells = []
+        cell = goal
+        while parent[cell] != -1:
+            # Links may span a straight run of cells (jump points); emit
+            # every unit step along the run
+            previous = parent[cell]
+            step = self.step(cell - previous)
+            while cell != previous:
+                actions.append(self.actions[step])
+                cells.append(self.coordinates(cell))
+                cell -= step
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+    def draw(self, cells=()):
+        """Return the maze as lines of text with the given cells marked "*"."""
+        marked = set(cells)
+        lines = []
+        for i in range(self.height):
+            line = []
+            for j in range(self.width):
+                if (i, j) == self.start:
+                    line.append("A")
+                elif (i, j) == self.goal:
+                    line.append("B")
+                elif (i, j) in marked:
+                    line.append("*")
+                elif self.passable[self.cell((i, j))]:
+                    line.append(" ")
+                else:
+                    line.append("#")
+            lines.append("".join(line))
+        return lines
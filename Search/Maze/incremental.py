@@ -0,0 +1,141 @@
+import heapq
+from array import array
+
+# Stands in for an infinite distance; fits the "i" arrays holding g and rhs
+INF = 2**31 - 1
+
+
+class IncrementalPlanner:
+    """D* Lite replanning on top of a Maze from Maze_A_search.
+
+    The search runs backwards from the goal and keeps its tree between calls.
+    After set_blocked and move_start, plan() repairs only the cells whose
+    distance to the goal changed instead of searching the whole maze again.
+    Blocking and opening cells edits the maze's grid in place.
+    """
+
+    def __init__(self, maze, start=None, goal=None):
+        self.maze = maze
+        self.grid = maze.grid
+        self.offsets = [offset for _, offset in self.grid.moves]
+        self.start, self.goal = maze.endpoints(start, goal)
+        self.last = self.start
+        self.km = 0  # heuristic drift from moving the start, added to keys
+
+        self.g = array("i", [INF]) * self.grid.size
+        self.rhs = array("i", [INF]) * self.grid.size
+        self.queue = []
+        self.queued = {}  # cell -> key of its live heap entry
+        self.num_explored = 0
+
+        self.rhs[self.goal] = 0
+        self.push(self.goal)
+
+    def cell(self, coordinates):
+        # The wall border is what keeps neighbour lookups in bounds, so it
+        # must never be opened or stood on
+        if not self.grid.inside(coordinates):
+            raise Exception("Cell must be inside the maze")
+        return self.grid.cell(coordinates)
+
+    def key(self, cell):
+        distance = min(self.g[cell], self.rhs[cell])
+        return (distance + self.maze.heuristic(self.start, cell) + self.km, distance)
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def top(self):
+        # Drop entries that were superseded or removed (lazy deletion)
+        while self.queue:
+            key, cell = self.queue[0]
+            if self.queued.get(cell) == key:
+                return key, cell
+            heapq.heappop(self.queue)
+        return None, None
+
+    def update(self, cell):
+        passable = self.grid.passable
+        if cell != self.goal:
+            best = INF
+            if passable[cell]:
+                for offset in self.offsets:
+                    neighbor = cell + offset
+                    if passable[neighbor] and self.g[neighbor] < best:
+                        best = self.g[neighbor]
+            self.rhs[cell] = min(best + 1, INF)
+        self.queued.pop(cell, None)
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell)
+
+    def compute(self):
+        g = self.g
+        rhs = self.rhs
+        while True:
+            key, cell = self.top()
+            start = self.start
+            if cell is None or (key >= self.key(start) and rhs[start] == g[start]):
+                return
+            new_key = self.key(cell)
+            if key < new_key:
+                self.push(cell)
+                continue
+            heapq.heappop(self.queue)
+            del self.queued[cell]
+            self.num_explored += 1
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = INF
+                self.update(cell)
+            for offset in self.offsets:
+                self.update(cell + offset)
+
+    def set_blocked(self, cell, blocked=True):
+        """Close or open the (row, col) cell; takes effect at the next plan()."""
+        cell = self.cell(cell)
+        if cell == self.goal or cell == self.start:
+            raise Exception("Cannot block the start or the goal")
+        if self.grid.passable[cell] == (not blocked):
+            return
+        self.grid.passable[cell] = 0 if blocked else 1
+        # Landmark and goal distances no longer match the maze
+        self.maze.forget_distances()
+        self.update(cell)
+        for offset in self.offsets:
+            self.update(cell + offset)
+
+    def move_start(self, cell):
+        """Move the agent to the (row, col) cell; takes effect at the next plan()."""
+        cell = self.cell(cell)
+        if not self.grid.passable[cell]:
+            raise Exception("Start must be an open cell")
+        self.start = cell
+        self.km += self.maze.heuristic(self.last, cell)
+        self.last = cell
+
+    def plan(self):
+        """Repair the search tree and return (actions, cells), or None."""
+        self.num_explored = 0
+        self.compute()
+        self.maze.solution = None
+        if self.g[self.start] == INF:
+            return None
+
+        passable = self.grid.passable
+        actions = []
+        cells = []
+        cell = self.start
+        while cell != self.goal:
+            best = None
+            for offset in self.offsets:
+                neighbor = cell + offset
+                if passable[neighbor] and (best is None or self.g[neighbor] < self.g[best]):
+                    best = neighbor
+            actions.append(self.grid.actions[best - cell])
+            cells.append(self.grid.coordinates(best))
+            cell = best
+        self.maze.solution = (actions, cells)
+        return self.maze.solution
@@ -0,0 +1,96 @@
+import struct
+import zlib
+from array import array
+
+# File header: magic, grid size, number of fields, checksum of the grid
+HEADER = struct.Struct("<4sIII")
+MAGIC = b"DST1"
+
+
+def save_fields(filename, grid, cells, fields):
+    """Write distance fields, and the cells they were measured from, to disk."""
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, grid.size, len(cells), zlib.crc32(grid.passable)))
+        array("i", cells).tofile(file)
+        for field in fields:
+            field.tofile(file)
+
+
+def load_fields(filename, grid):
+    """Read fields written by save_fields for this grid.
+
+    Returns (cells, fields), or None if the file is missing or was computed
+    for a different maze.
+    """
+    try:
+        with open(filename, "rb") as file:
+            magic, size, count, checksum = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or size != grid.size or checksum != zlib.crc32(grid.passable):
+                return None
+            cells = array("i")
+            cells.fromfile(file, count)
+            fields = []
+            for _ in range(count):
+                field = array("i")
+                field.fromfile(file, size)
+                fields.append(field)
+    except (OSError, EOFError, struct.error):
+        return None
+    return list(cells), fields
+
+
+class Landmarks:
+    """Exact distance fields from a few landmark cells, used as ALT heuristics.
+
+    For any landmark L the triangle inequality gives
+    |d(L, goal) - d(L, state)| <= d(state, goal), so the largest such gap is
+    an admissible, consistent estimate that follows the corridors of the maze
+    rather than the straight line.
+    """
+
+    def __init__(self, cells, fields):
+        self.cells = cells
+        self.fields = fields
+
+    @classmethod
+    def select(cls, grid, count=8, measure=None):
+        """Pick landmarks by farthest-point sampling and measure their fields.
+
+        measure(grid, cell) computes a distance field; it defaults to
+        grid.distances, and wavefront.distances is a drop-in replacement for
+        large open grids.
+        """
+        if measure is None:
+            measure = type(grid).distances
+        # Each new landmark is the cell farthest from every one chosen so far,
+        # starting from the start cell, which spreads them to the far corners
+        nearest = measure(grid, grid.cell(grid.start))
+        cells = []
+        fields = []
+        for _ in range(count):
+            landmark = max(range(grid.size), key=nearest.__getitem__)
+            if nearest[landmark] <= 0:
+                break
+            field = measure(grid, landmark)
+            cells.append(landmark)
+            fields.append(field)
+            nearest = array("i", map(min, nearest, field))
+        return cls(cells, fields)
+
+    @classmethod
+    def load(cls, filename, grid):
+        loaded = load_fields(filename, grid)
+        return cls(*loaded) if loaded else None
+
+    def save(self, filename, grid):
+        save_fields(filename, grid, self.cells, self.fields)
+
+    def heuristic(self, state, goal):
+        best = 0
+        for field in self.fields:
+            gap = field[state] - field[goal]
+            if gap < 0:
+                gap = -gap
+            if gap > best:
+                best = gap
+        return best
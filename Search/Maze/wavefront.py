@@ -0,0 +1,61 @@
+from array import array
+
+import numpy as np
+
+
+def distance_map(grid, source):
+    """Return breadth-first distances from source as a 2-D int32 array.
+
+    The array covers the padded grid, so map.ravel()[cell] is the distance of
+    a cell id; walls and unreachable cells are -1. The frontier is an array
+    of cell ids and each step expands all of it at once, so the Python loop
+    runs once per distance rather than once per cell. That pays off when the
+    frontier is wide, as on open floors; along narrow corridors the per-step
+    overhead makes Grid.distances the faster choice.
+    """
+    unreached = np.frombuffer(grid.passable, dtype=np.uint8)[:grid.size].astype(bool)
+    distance = np.full(grid.size, -1, dtype=np.int32)
+    offsets = np.array([offset for _, offset in grid.moves], dtype=np.intp)
+
+    frontier = np.array([source], dtype=np.intp)
+    distance[source] = 0
+    unreached[source] = False
+    steps = 0
+    while frontier.size:
+        steps += 1
+        # The wall border keeps every neighbour id inside the grid
+        neighbors = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(neighbors[unreached[neighbors]])
+        unreached[frontier] = False
+        distance[frontier] = steps
+    return distance.reshape(grid.height + 2, grid.stride)
+
+
+def distances(grid, source):
+    """Same as Grid.distances, for use as a landmark or goal distance field."""
+    return array("i", distance_map(grid, source).tobytes())
+
+
+def descend(grid, distance, goal):
+    """Walk from goal down the distance map to its source.
+
+    Returns (actions, cells) for the path from the source to goal, or None
+    if goal was not reached.
+    """
+    # A memoryview indexes to plain ints, much faster than NumPy scalars
+    distance = memoryview(np.ascontiguousarray(distance).ravel())
+    if distance[goal] == -1:
+        return None
+    actions = []
+    cells = []
+    cell = goal
+    while distance[cell] > 0:
+        for action, offset in grid.moves:
+            if distance[cell - offset] == distance[cell] - 1:
+                actions.append(action)
+                cells.append(grid.coordinates(cell))
+                cell -= offset
+                break
+    actions.reverse()
+    cells.reverse()
+    return (actions, cells)